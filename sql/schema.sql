@@ -42,9 +42,23 @@ CREATE TABLE IF NOT EXISTS post_topics (
     PRIMARY KEY (post_id, topic_id)
 );
 
+-- LLM response cache - keyed by SHA-256 of (model, prompt, schema, reasoning effort)
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    response JSONB NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
 -- Indexes for performance
-CREATE INDEX IF NOT EXISTS idx_posts_blog_id ON posts(blog_id);
+-- (blogs.url and posts.url are already covered by their UNIQUE constraints)
 CREATE INDEX IF NOT EXISTS idx_posts_discovered_date ON posts(discovered_date);
+-- Per-blog post listing: WHERE blog_id = ? ORDER BY publication_date DESC.
+-- Leads with blog_id, so it also serves plain blog_id lookups and FK checks;
+-- the older single-column index is redundant and only slowed down inserts.
+CREATE INDEX IF NOT EXISTS idx_posts_blog_id_publication_date ON posts(blog_id, publication_date DESC);
+DROP INDEX IF EXISTS idx_posts_blog_id;
+-- Topic-side lookups and ON DELETE CASCADE from topics (the PK leads with post_id)
+CREATE INDEX IF NOT EXISTS idx_post_topics_topic_id ON post_topics(topic_id);
 
 -- Note: The production database also has these tables/constraints that are not used by this codebase:
 -- - users table (referenced by blogs.last_modified_by)
@@ -1,63 +1,71 @@
 import datetime
 import json
+import re
 from typing import Annotated, Any
-from urllib.parse import urlparse
 
+import psycopg2.extras
 import typer
-from bs4 import BeautifulSoup
 
 from blogregator.database import get_connection
 from blogregator.llm import generate_json_from_llm
-from blogregator.parser import parse_post_list
+from blogregator.parser import extract_body_html, parse_post_list
 from blogregator.prompts import CORRECT_SCHEMA, GENERATE_SCHEMA
 from blogregator.utils import fetch_with_retries
 
 blog_cli = typer.Typer(name="blog", help="Manage and interact with blogs in the registry.")
 
 
+# Rows fetched from the server (and echoed) per round-trip by `blog list`
+_LIST_BATCH_SIZE = 500
+
+
 @blog_cli.command(name="list")
 def list_blogs():
     """List all monitored blogs with status and last checked date."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT id, name, url, status, last_checked FROM blogs ORDER BY id")
-    rows = cursor.fetchall()
-    conn.close()
+    with get_connection() as conn:
+        # Stream rows through a server-side cursor so the whole table is never
+        # buffered, and write each batch with one echo instead of one per row
+        cursor = conn.cursor(name="list_blogs")
+        cursor.execute("SELECT id, name, url, status, last_checked FROM blogs ORDER BY id")
+        rows = cursor.fetchmany(_LIST_BATCH_SIZE)
+        if not rows:
+            typer.echo("No blogs found.")
+            return
 
-    if not rows:
-        typer.echo("No blogs found.")
-        return
+        typer.echo(f"{'ID':<4} {'Name':<20} {'Status':<10} {'Last Checked'}")
+        while rows:
+            lines = []
+            for r in rows:
+                last = r["last_checked"] or "Never"
+                lines.append(f"{r['id']:<4} {r['name']:<20} {r['status']:<10} {last}")
+            typer.echo("\n".join(lines))
+            rows = cursor.fetchmany(_LIST_BATCH_SIZE)
+        cursor.close()
 
-    typer.echo(f"{'ID':<4} {'Name':<20} {'Status':<10} {'Last Checked'}")
-    for r in rows:
-        last = r["last_checked"] or "Never"
-        typer.echo(f"{r['id']:<4} {r['name']:<20} {r['status']:<10} {last}")
 
+def generate_schema(html_content, url, use_cache=True):
+    """Use Gemini to generate a parser function for the blog.
 
-def generate_schema(html_content, url):
-    """Use Gemini to generate a parser function for the blog."""
+    With use_cache=False the cached schema for an unchanged page is bypassed and
+    a fresh (sampled) one is generated, e.g. when the cached one was wrong.
+    """
     formatted_prompt = GENERATE_SCHEMA.format(html_content=html_content, blog_url=url)
-    return generate_json_from_llm(formatted_prompt)
+    return generate_json_from_llm(formatted_prompt, use_cache=use_cache)
+
+
+# Optional scheme and userinfo, optional 'www.', then the first hostname label
+# (stops at the next dot, port separator, or path)
+_DOMAIN_RE = re.compile(
+    r"^(?:[a-z][a-z0-9+.-]*://)?(?:[^@/]*@)?(?:www\.)?([^./:@]+)", re.IGNORECASE
+)
 
 
 def get_domain_name(url: str) -> str:
     """
     Return the main domain name of a URL (without 'www.' or any subdomains/TLDs).
     """
-    # Parse out the network location part
-    netloc = urlparse(url).netloc
-
-    # Remove port if present (e.g. 'example.com:8080')
-    hostname = netloc.split(":")[0]
-
-    # Strip leading 'www.' if it’s there
-    if hostname.startswith("www."):
-        hostname = hostname[4:]
-
-    # Take the first segment before any remaining dots
-    main_domain = hostname.split(".")[0]
-
-    return main_domain
+    match = _DOMAIN_RE.match(url)
+    return match.group(1) if match else ""
 
 
 def format_post_date(post: dict[str, Any]) -> str | None:
@@ -66,40 +74,36 @@ def format_post_date(post: dict[str, Any]) -> str | None:
     if not pub_date:
         return None
 
+    # parse_post_list emits ISO timestamps; fromisoformat is C-implemented and
+    # much cheaper than strptime for the leading YYYY-MM-DD part
     try:
-        return datetime.datetime.strptime(pub_date, "%Y-%m-%d").strftime("%Y-%m-%d")
+        return datetime.date.fromisoformat(pub_date[:10]).isoformat()
     except ValueError:
         return pub_date
 
 
 def format_post_for_display(post: dict[str, Any], index: int) -> str:
     """Format a single post for display in the console."""
-    result = f"Post {index}:\n"
-    result += f"Title: {post.get('title', 'No title found')}\n"
-    result += f"URL: {post.get('post_url', 'No URL found')}\n"
-
     pub_date = format_post_date(post)
-    if pub_date:
-        result += f"Date: {pub_date}\n"
-
-    return result
+    return (
+        f"Post {index}:\n"
+        f"Title: {post.get('title', 'No title found')}\n"
+        f"URL: {post.get('post_url', 'No URL found')}\n"
+        + (f"Date: {pub_date}\n" if pub_date else "")
+    )
 
 
 def display_posts(posts: list[dict[str, Any]], message: str = "Found posts:") -> None:
     """Display posts in a consistent format."""
-    typer.echo(f"\n{message}")
+    # Build the whole listing first and write it with a single echo
+    lines = [f"\n{message}"]
     for i, post in enumerate(posts, 1):
-        typer.echo(f"\nPost {i}:")
-        typer.echo(f"Title: {post.get('title', 'No title found')}")
-        typer.echo(f"URL: {post.get('post_url', 'No URL found')}")
-
-        pub_date = format_post_date(post)
-        if pub_date:
-            typer.echo(f"Date: {pub_date}")
+        lines.append(f"\n{format_post_for_display(post, i).rstrip()}")
+    typer.echo("\n".join(lines))
 
 
-def save_blog_to_database(conn, name, url, schema, status="Active", update_existing=False):
-    """Save the blog information to the database.
+def save_blog_to_database(conn, name, url, schema, status="Active"):
+    """Save the blog information to the database, updating it if the URL already exists.
 
     Args:
         conn: Database connection
@@ -107,27 +111,25 @@ def save_blog_to_database(conn, name, url, schema, status="Active", update_exist
         url: Blog URL
         schema: Scraping schema (JSON)
         status: Blog status ('Active', 'Error', etc.)
-        update_existing: If True, update existing blog instead of inserting new one
     """
     typer.echo(f"Saving blog to database with status: {status}...")
 
     cursor = conn.cursor()
-
-    if update_existing:
-        cursor.execute(
-            """UPDATE blogs
-            SET name = %s, scraping_schema = %s, status = %s
-            WHERE url = %s""",
-            (name, json.dumps(schema), status, url),
-        )
-        typer.echo(f"Successfully updated blog: {name} ({url})")
-    else:
-        cursor.execute(
-            """INSERT INTO blogs (name, url, scraping_schema, status)
-            VALUES (%s, %s, %s, %s)""",
-            (name, url, json.dumps(schema), status),
-        )
+    # Single upsert; xmax = 0 only for freshly inserted rows
+    cursor.execute(
+        """INSERT INTO blogs (name, url, scraping_schema, status)
+        VALUES (%s, %s, %s, %s)
+        ON CONFLICT (url) DO UPDATE SET
+            name = EXCLUDED.name,
+            scraping_schema = EXCLUDED.scraping_schema,
+            status = EXCLUDED.status
+        RETURNING (xmax = 0) AS inserted""",
+        (name, url, psycopg2.extras.Json(schema), status),
+    )
+    if cursor.fetchone()["inserted"]:
         typer.echo(f"Successfully added blog: {name} ({url})")
+    else:
+        typer.echo(f"Successfully updated blog: {name} ({url})")
 
     conn.commit()
 
@@ -141,20 +143,21 @@ def add_blog(
             help="A string name describing the blog. Will be generated from URL if not provided."
         ),
     ] = None,
+    cache: Annotated[
+        bool,
+        typer.Option(help="Reuse a previously generated schema if the page is unchanged."),
+    ] = True,
 ):
-    # check if blog already in database
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT COUNT(*) FROM blogs WHERE url = %s", (url,))
-    count = cursor.fetchone()["count"]
-    if count > 0:
+    # check if blog already in database. The save is an upsert, so no connection
+    # needs to be held across the fetch, the LLM calls and the prompts below.
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1 FROM blogs WHERE url = %s LIMIT 1", (url,))
+        exists = cursor.fetchone() is not None
+    if exists:
         if not typer.confirm(f"Blog with URL {url} already exists. Overwrite?"):
-            conn.close()
             return
         typer.echo(f"Updating existing blog: {url}")
-        update_existing = True
-    else:
-        update_existing = False
 
     typer.echo(f"Adding blog: {url}")
 
@@ -163,12 +166,12 @@ def add_blog(
 
     # TODO: error handling
     typer.echo("Fetching HTML content...")
-    content = fetch_with_retries(url).content
-    body = str(BeautifulSoup(content, "html.parser").body)
+    content = fetch_with_retries(url).text
+    body = extract_body_html(content)
 
     typer.echo("Generating parser function...")
 
-    schema = generate_schema(body, url)
+    schema = generate_schema(body, url, use_cache=cache)
     typer.echo("JSON Schema -----")
     typer.echo(schema)
     typer.echo("-----------------")
@@ -179,7 +182,7 @@ def add_blog(
     posts = []
 
     try:
-        posts = parse_post_list(url, schema)
+        posts = parse_post_list(url, schema, html=content)
         if posts:
             first_attempt_success = True
             display_posts(posts, "Found posts using the generated schema:")
@@ -192,7 +195,8 @@ def add_blog(
     # If first attempt was successful, ask for confirmation
     if first_attempt_success:
         if typer.confirm("\nDoes this look correct?"):
-            save_blog_to_database(conn, name, url, schema, update_existing=update_existing)
+            with get_connection() as conn:
+                save_blog_to_database(conn, name, url, schema)
             return
 
     user_feedback = typer.prompt("Please provide feedback on what went wrong")
@@ -228,7 +232,7 @@ def add_blog(
 
         typer.echo("\nTrying the improved schema...")
 
-        improved_posts = parse_post_list(url, improved_schema)
+        improved_posts = parse_post_list(url, improved_schema, html=content)
         if improved_posts:
             display_posts(improved_posts, "Found posts using the improved schema:")
         else:
@@ -239,17 +243,13 @@ def add_blog(
     # If we got an improved schema (even if it had errors), ask if user wants to save it
     if improved_schema:
         status = "Active" if improved_posts else "Error"
-        save_blog_to_database(
-            conn, name, url, improved_schema, status=status, update_existing=update_existing
-        )
+        with get_connection() as conn:
+            save_blog_to_database(conn, name, url, improved_schema, status=status)
     else:
         # No improved schema was generated
         typer.echo("Failed to generate an improved schema.")
         if typer.confirm("\nSave the original schema with an error status?"):
-            save_blog_to_database(
-                conn, name, url, schema, status="Error", update_existing=update_existing
-            )
+            with get_connection() as conn:
+                save_blog_to_database(conn, name, url, schema, status="Error")
         else:
             typer.echo("Aborting blog addition. No schema saved.")
-            conn.close()
-    conn.close()
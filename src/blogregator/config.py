@@ -28,6 +28,7 @@ class Config:
     new_blog_grace_period_hours: int = 1
     log_level: str = "INFO"
     max_workers: int = 8
+    max_concurrent_blogs: int = 4
 
     @classmethod
     def from_env(cls) -> "Config":
@@ -83,6 +84,7 @@ class Config:
         new_blog_grace_period_hours = int(os.getenv("NEW_BLOG_GRACE_PERIOD_HOURS", "1"))
         log_level = os.getenv("LOG_LEVEL", "INFO").upper()
         max_workers = int(os.getenv("MAX_WORKERS", "8"))
+        max_concurrent_blogs = int(os.getenv("MAX_CONCURRENT_BLOGS", "4"))
 
         return cls(
             database_url=database_url,
@@ -98,6 +100,7 @@ class Config:
             new_blog_grace_period_hours=new_blog_grace_period_hours,
             log_level=log_level,
             max_workers=max_workers,
+            max_concurrent_blogs=max_concurrent_blogs,
         )
 
 
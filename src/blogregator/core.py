@@ -1,21 +1,59 @@
 """Core business logic for blog checking and newsletter sending."""
 
+import concurrent.futures
+import functools
 import json
 import logging
+import logging.handlers
 import multiprocessing as mp
 import os
+import sys
 from dataclasses import dataclass
 
-import psycopg2.extras
-
-from blogregator.database import get_connection, log_error
+from blogregator.database import get_connection, log_error, tuple_cursor
 from blogregator.emails import notify
 from blogregator.parser import parse_post_list
-from blogregator.post import add_post_to_db, process_single_post
+from blogregator.post import add_posts_to_db, fetch_topic_names, process_single_post
 
 logger = logging.getLogger(__name__)
 
 
+def _forkserver_preload() -> list[str]:
+    """Modules the forkserver imports once so post workers start with them loaded."""
+    # Workers re-run the main module as __mp_main__; when that is one of ours
+    # (e.g. `python -m blogregator.server`), preloading it means only its body
+    # re-runs, not its imports.
+    main_spec = getattr(sys.modules["__main__"], "__spec__", None)
+    main_name = getattr(main_spec, "name", None)
+    preload = ["blogregator.post"]
+    if main_name and main_name.startswith("blogregator."):
+        preload.append(main_name)
+    return preload
+
+
+# Blogs are checked from worker threads, and forking a multi-threaded process
+# can deadlock the child on locks held by other threads. The forkserver context
+# forks post workers from a clean single-threaded server instead, which has
+# already imported the post-processing stack (litellm is slow to import).
+# Platforms without forkserver (Windows) fall back to spawn. The context is
+# built on first use so importing this module works everywhere.
+@functools.cache
+def _get_mp_context() -> mp.context.BaseContext:
+    """Return the multiprocessing context used for post workers."""
+    if "forkserver" not in mp.get_all_start_methods():
+        return mp.get_context("spawn")
+    ctx = mp.get_context("forkserver")
+    ctx.set_forkserver_preload(_forkserver_preload())
+    return ctx
+
+
+def _init_post_worker(log_queue, log_level: int) -> None:
+    """Send a post worker's log records to the parent's handlers via log_queue."""
+    root = logging.getLogger()
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(log_level)
+
+
 @dataclass
 class CheckMetrics:
     """Metrics from a blog check operation."""
@@ -27,6 +65,8 @@ class CheckMetrics:
     llm_missing_summary: int = 0
     llm_missing_reading_time: int = 0
     llm_missing_topics: int = 0
+    # Set when the blog's post list failed to parse and the blog was disabled
+    blog_disabled: bool = False
 
 
 @dataclass
@@ -41,12 +81,18 @@ class CheckResult:
 
 
 def fetch_blogs(cursor, blog_id: int | None):
-    """Retrieve active blogs or a specific blog by ID."""
+    """Retrieve active blogs or a specific blog by ID.
+
+    Only the columns process_blog needs are selected, so unused TEXT columns
+    like proposed_schema are never read off disk or sent over the wire.
+    """
     if blog_id is not None:
-        cursor.execute("SELECT * FROM blogs WHERE id = %s", (blog_id,))
+        cursor.execute("SELECT id, url, scraping_schema FROM blogs WHERE id = %s", (blog_id,))
     else:
         # Use scraping_successful to determine active blogs
-        cursor.execute("SELECT * FROM blogs WHERE scraping_successful = true", ())
+        cursor.execute(
+            "SELECT id, url, scraping_schema FROM blogs WHERE scraping_successful = true", ()
+        )
     return cursor.fetchall()
 
 
@@ -93,12 +139,15 @@ def process_blog(conn, blog, max_workers: int = 8) -> CheckMetrics:
             "UPDATE blogs SET scraping_successful = false, last_checked = NOW() WHERE id = %s",
             (blog["id"],),
         )
-        return CheckMetrics()
+        return CheckMetrics(blog_disabled=True)
 
-    # Find new posts
+    # Find new posts; an empty listing has nothing to look up
     post_urls = [p["post_url"] for p in posts]
-    cursor.execute("SELECT url FROM posts WHERE url = ANY(%s)", (post_urls,))
-    existing = {row["url"] for row in cursor.fetchall()}
+    existing = set()
+    if post_urls:
+        url_cursor = tuple_cursor(conn)
+        url_cursor.execute("SELECT url FROM posts WHERE url = ANY(%s)", (post_urls,))
+        existing = {url for (url,) in url_cursor}
 
     new_posts = [p for p in posts if p["post_url"] not in existing]
 
@@ -126,22 +175,45 @@ def process_blog(conn, blog, max_workers: int = 8) -> CheckMetrics:
             },
         )
 
+        # Load the topic list once for the whole batch rather than once per post.
+        # Scheduled checks opt into the LLM cache, so posts re-seen after a
+        # failed save aren't re-summarized.
+        process_post = functools.partial(
+            process_single_post, existing_topics=fetch_topic_names(conn), use_cache=True
+        )
+
         # Use imap_unordered with timeout to prevent hanging on stuck posts
         # Each post gets up to 2 minutes (Playwright timeout + buffer)
         per_post_timeout = 120
-        with mp.Pool(processes=max_workers_actual) as pool:
-            async_results = pool.imap_unordered(process_single_post, new_posts)
-            for _ in new_posts:
-                try:
-                    result = async_results.next(timeout=per_post_timeout)
-                    results.append(result)
-                except mp.TimeoutError:
-                    logger.warning(
-                        f"Post processing timed out after {per_post_timeout}s",
-                        extra={"blog_id": blog["id"], "blog_name": blog_name},
-                    )
-                except StopIteration:
-                    break
+        # Workers don't inherit this process's logging setup, so their records
+        # are forwarded here and written by the same handlers
+        root_logger = logging.getLogger()
+        mp_context = _get_mp_context()
+        log_queue = mp_context.Queue()
+        log_listener = logging.handlers.QueueListener(
+            log_queue, *root_logger.handlers, respect_handler_level=True
+        )
+        log_listener.start()
+        try:
+            with mp_context.Pool(
+                processes=max_workers_actual,
+                initializer=_init_post_worker,
+                initargs=(log_queue, root_logger.getEffectiveLevel()),
+            ) as pool:
+                async_results = pool.imap_unordered(process_post, new_posts)
+                for _ in new_posts:
+                    try:
+                        result = async_results.next(timeout=per_post_timeout)
+                        results.append(result)
+                    except mp.TimeoutError:
+                        logger.warning(
+                            f"Post processing timed out after {per_post_timeout}s",
+                            extra={"blog_id": blog["id"], "blog_name": blog_name},
+                        )
+                    except StopIteration:
+                        break
+        finally:
+            log_listener.stop()
 
     # Batch database operations
     posts_to_save = []
@@ -166,29 +238,17 @@ def process_blog(conn, blog, max_workers: int = 8) -> CheckMetrics:
             )
             log_error(cursor, blog["id"], "llm", result.error_message or "LLM extraction failed")
 
-    # Add new topics first
+    # Add new topics first. Blogs commit concurrently, so insert in sorted order:
+    # every transaction then takes the topics.name index locks in the same
+    # order and two blogs adding the same new topics can't deadlock.
     if all_topics:
-        psycopg2.extras.execute_values(
-            cursor,
-            "INSERT INTO topics (name) VALUES %s ON CONFLICT DO NOTHING",
-            [(topic,) for topic in all_topics],
+        cursor.execute(
+            "INSERT INTO topics (name) SELECT unnest(%s::text[]) ON CONFLICT DO NOTHING",
+            (sorted(all_topics),),
         )
 
-    # Add posts to database
-    for result in posts_to_save:
-        metadata = {
-            "summary": result.summary,
-            "reading_time": result.reading_time,
-            "matched_topics": result.topics or [],
-            "new_topic_suggestions": [],
-        }
-        add_post_to_db(
-            cursor,
-            blog["id"],
-            result.original_post,
-            metadata,
-            full_text=result.extracted_text,
-        )
+    # Add posts to database, all in one statement
+    add_posts_to_db(cursor, blog["id"], posts_to_save)
 
     # Update last_checked timestamp and mark as successful
     cursor.execute(
@@ -223,13 +283,26 @@ def process_blog(conn, blog, max_workers: int = 8) -> CheckMetrics:
     return metrics
 
 
-def run_blog_check(blog_id: int | None = None, max_workers: int = 8) -> CheckResult:
+def _check_blog(blog, max_workers: int) -> CheckMetrics:
+    """Check a single blog on its own connection and commit the results."""
+    with get_connection() as conn:
+        return process_blog(conn, blog, max_workers=max_workers)
+
+
+def run_blog_check(
+    blog_id: int | None = None, max_workers: int = 8, max_concurrent_blogs: int = 4
+) -> CheckResult:
     """
     Run one-off check for new posts.
 
+    Blogs are checked concurrently, each on its own database connection. The
+    max_workers post-processing budget is split between the blogs in flight, so
+    the total number of worker processes stays bounded by max_workers.
+
     Args:
         blog_id: Optional specific blog ID to check. If None, checks all active blogs.
         max_workers: Maximum number of parallel workers for processing posts
+        max_concurrent_blogs: Maximum number of blogs checked at the same time
 
     Returns:
         CheckResult with summary of the operation
@@ -242,12 +315,13 @@ def run_blog_check(blog_id: int | None = None, max_workers: int = 8) -> CheckRes
 
     try:
         conn = get_connection()
-        cursor = conn.cursor()
+        try:
+            blogs = fetch_blogs(conn.cursor(), blog_id)
+        finally:
+            conn.close()
 
-        blogs = fetch_blogs(cursor, blog_id)
         if not blogs:
             logger.warning("No blogs found to check", extra={"blog_id": blog_id})
-            conn.close()
             return CheckResult(
                 success=True,
                 blogs_checked=0,
@@ -260,10 +334,26 @@ def run_blog_check(blog_id: int | None = None, max_workers: int = 8) -> CheckRes
         totals = CheckMetrics()
         blog_parse_errors = 0
 
-        for blog in blogs:
-            try:
-                metrics = process_blog(conn, blog, max_workers=max_workers)
-                conn.commit()
+        concurrent_blogs = max(1, min(max_concurrent_blogs, len(blogs), max_workers))
+        workers_per_blog = max(1, max_workers // concurrent_blogs)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=concurrent_blogs) as executor:
+            futures = {executor.submit(_check_blog, blog, workers_per_blog): blog for blog in blogs}
+            for future in concurrent.futures.as_completed(futures):
+                blog = futures[future]
+                try:
+                    metrics = future.result()
+                except Exception as e:
+                    blog_name_err = (
+                        blog["url"].split("//")[-1].split("/")[0] if blog.get("url") else "Unknown"
+                    )
+                    logger.error(
+                        "Error processing blog",
+                        extra={"blog_id": blog["id"], "blog_name": blog_name_err, "error": str(e)},  # type: ignore
+                        exc_info=True,
+                    )
+                    # Continue processing other blogs
+                    continue
 
                 # Aggregate metrics
                 totals.new_posts_found += metrics.new_posts_found
@@ -274,32 +364,8 @@ def run_blog_check(blog_id: int | None = None, max_workers: int = 8) -> CheckRes
                 totals.llm_missing_reading_time += metrics.llm_missing_reading_time
                 totals.llm_missing_topics += metrics.llm_missing_topics
 
-                # Check if blog was disabled due to parse errors
-                if (
-                    metrics.new_posts_found == 0
-                    and metrics.full_success == 0
-                    and metrics.partial_success == 0
-                ):
-                    cursor.execute(
-                        "SELECT scraping_successful FROM blogs WHERE id = %s", (blog["id"],)
-                    )  # type: ignore
-                    status_row = cursor.fetchone()
-                    if status_row and not status_row["scraping_successful"]:  # type: ignore
-                        blog_parse_errors += 1
-
-            except Exception as e:
-                blog_name_err = (
-                    blog["url"].split("//")[-1].split("/")[0] if blog.get("url") else "Unknown"
-                )
-                logger.error(
-                    "Error processing blog",
-                    extra={"blog_id": blog["id"], "blog_name": blog_name_err, "error": str(e)},  # type: ignore
-                    exc_info=True,
-                )
-                conn.rollback()
-                # Continue processing other blogs
-
-        conn.close()
+                if metrics.blog_disabled:
+                    blog_parse_errors += 1
 
         posts_added = totals.full_success + totals.partial_success
         logger.info(
@@ -1,18 +1,173 @@
 import logging
 import os
+import threading
+import time
 
 import psycopg2
 import psycopg2.extras
+import psycopg2.pool
 
 logger = logging.getLogger(__name__)
 
+POOL_MIN_SIZE = 1
+DEFAULT_POOL_MAX_SIZE = 10
+# Pooled connections idle for longer than this are pinged before being handed
+# out, so sockets dropped by a database restart or an idle timeout (Neon,
+# Supabase) are replaced instead of failing the caller's first query.
+DEFAULT_POOL_IDLE_CHECK_SECONDS = 30.0
+
+_pool: psycopg2.pool.ThreadedConnectionPool | None = None
+_pool_pid: int | None = None
+_pool_lock = threading.Lock()
+# id(raw connection) -> time.monotonic() when it was last returned to the pool
+_idle_since: dict[int, float] = {}
+
+
+class PooledConnection:
+    """
+    Thin proxy around a pooled psycopg2 connection.
+
+    Behaves like the underlying connection, except that close() rolls back any
+    open transaction and hands the connection back to the pool instead of
+    tearing down the socket. This keeps the existing `conn.close()` call sites
+    working unchanged.
+
+    Can also be used as a context manager: `with get_connection() as conn:`
+    commits on success, rolls back on error, and always releases the
+    connection on exit.
+
+    A proxy created without a pool wraps a dedicated connection, which close()
+    really closes.
+    """
+
+    def __init__(self, pool: psycopg2.pool.ThreadedConnectionPool | None, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if self._conn is not None and not self._conn.closed:
+                if exc_type is None:
+                    self._conn.commit()
+                else:
+                    self._conn.rollback()
+        finally:
+            self.close()
+
+    def close(self):
+        if self._conn is None:
+            return
+        conn, self._conn = self._conn, None
+        if self._pool is None:
+            conn.close()
+            return
+        broken = bool(conn.closed)
+        if not broken:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                broken = True
+        if broken:
+            _idle_since.pop(id(conn), None)
+        else:
+            _idle_since[id(conn)] = time.monotonic()
+        self._pool.putconn(conn, close=broken)
+
+
+def _get_pool(database_url: str) -> psycopg2.pool.ThreadedConnectionPool:
+    """Return the connection pool for this process, creating it on first use."""
+    global _pool, _pool_pid
+    with _pool_lock:
+        # Worker processes forked by multiprocessing inherit the parent's pool.
+        # Sharing libpq sockets across processes is unsafe, so each process
+        # builds its own pool and abandons (without closing) the inherited one.
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = psycopg2.pool.ThreadedConnectionPool(
+                POOL_MIN_SIZE,
+                int(os.environ.get("DB_POOL_MAX_SIZE", DEFAULT_POOL_MAX_SIZE)),
+                database_url,
+                cursor_factory=psycopg2.extras.RealDictCursor,
+            )
+            _pool_pid = os.getpid()
+        return _pool
+
 
 def get_connection():
     database_url = os.environ.get("DATABASE_URL")
     if not database_url:
         raise ValueError("DATABASE_URL environment variable is required!")
-    conn = psycopg2.connect(database_url, cursor_factory=psycopg2.extras.RealDictCursor)
-    return conn
+    pool = _get_pool(database_url)
+    try:
+        return PooledConnection(pool, _checkout(pool))
+    except psycopg2.pool.PoolError:
+        # Pool exhausted: fall back to a dedicated connection rather than failing.
+        logger.warning("Connection pool exhausted, opening a dedicated connection")
+        conn = psycopg2.connect(database_url, cursor_factory=psycopg2.extras.RealDictCursor)
+        return PooledConnection(None, conn)
+
+
+def _is_alive(conn) -> bool:
+    """Return True if conn answers a trivial query."""
+    try:
+        cursor = conn.cursor(cursor_factory=psycopg2.extensions.cursor)
+        cursor.execute("SELECT 1")
+        cursor.close()
+        conn.rollback()
+        return True
+    except psycopg2.Error:
+        return False
+
+
+def _checkout(pool: psycopg2.pool.ThreadedConnectionPool):
+    """
+    Take a usable connection from the pool.
+
+    Connections that are closed, or that fail a `SELECT 1` after sitting idle
+    longer than DB_POOL_IDLE_CHECK_SECONDS, are discarded and the next one is
+    tried. Once the idle connections run out the pool opens a fresh one, whose
+    connect error (e.g. the database is down) propagates to the caller.
+    """
+    idle_check = float(
+        os.environ.get("DB_POOL_IDLE_CHECK_SECONDS", DEFAULT_POOL_IDLE_CHECK_SECONDS)
+    )
+    # Bounded so a pool that keeps producing dead connections still gives up
+    for _ in range(pool.maxconn + 1):
+        conn = pool.getconn()
+        released = _idle_since.pop(id(conn), None)
+        if not conn.closed and (
+            released is None or time.monotonic() - released <= idle_check or _is_alive(conn)
+        ):
+            return conn
+        logger.warning("Discarding dead pooled database connection")
+        pool.putconn(conn, close=True)
+    return pool.getconn()
+
+
+def tuple_cursor(conn):
+    """
+    Return a cursor on conn that yields plain tuples.
+
+    Connections default to RealDictCursor, which builds a dict per row. For
+    narrow lookups that only read values positionally, a plain cursor skips
+    that per-row allocation.
+    """
+    return conn.cursor(cursor_factory=psycopg2.extensions.cursor)
+
+
+def close_pool():
+    """Close every connection held by this process's pool."""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.closeall()
+        _pool = None
+        _pool_pid = None
 
 
 def init_database(sql_file: str = "sql/schema.sql"):
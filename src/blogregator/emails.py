@@ -11,33 +11,37 @@ from blogregator.database import get_connection
 def get_new_posts(hour_window: int = 8) -> list[Mapping[str, Any]]:
     """Get new posts discovered in the last hour_window hours."""
     config = get_config()
-    conn = get_connection()
-    cursor = conn.cursor()
-    # find all posts discovered in the last hour_window hours
-    # exclude posts from newly added blogs (discovered within grace period after blog creation)
-    cursor.execute(
-        """
-        SELECT
-            p.id,
-            p.title,
-            p.url,
-            p.publication_date,
-            p.reading_time,
-            p.summary,
-            b.url as blog_name,
-            STRING_AGG(t.name, ', ' ORDER BY t.name) as topics
-        FROM posts p
-        LEFT JOIN post_topics tp ON p.id = tp.post_id
-        LEFT JOIN topics t ON t.id = tp.topic_id
-        LEFT JOIN blogs b ON b.id = p.blog_id
-        WHERE discovered_date > NOW() - INTERVAL %s
-          AND discovered_date >= b.created_at + INTERVAL %s
-        GROUP BY p.id, b.id, b.url;
-        """,
-        (f"'{hour_window} hour'", f"'{config.new_blog_grace_period_hours} hour'"),
-    )
-    posts = cursor.fetchall()
-    conn.close()
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        # find all posts discovered in the last hour_window hours
+        # exclude posts from newly added blogs (discovered within grace period after blog creation)
+        # topics are aggregated per post in a lateral subquery, so the window's
+        # posts are never fanned out into (post, topic) rows and regrouped
+        cursor.execute(
+            """
+            SELECT
+                p.id,
+                p.title,
+                p.url,
+                p.publication_date,
+                p.reading_time,
+                p.summary,
+                b.url as blog_name,
+                pt.topics
+            FROM posts p
+            LEFT JOIN blogs b ON b.id = p.blog_id
+            LEFT JOIN LATERAL (
+                SELECT STRING_AGG(t.name, ', ' ORDER BY t.name) as topics
+                FROM post_topics tp
+                JOIN topics t ON t.id = tp.topic_id
+                WHERE tp.post_id = p.id
+            ) pt ON true
+            WHERE discovered_date > NOW() - INTERVAL %s
+              AND discovered_date >= b.created_at + INTERVAL %s;
+            """,
+            (f"'{hour_window} hour'", f"'{config.new_blog_grace_period_hours} hour'"),
+        )
+        posts = cursor.fetchall()
     return posts  # type: ignore
 
 
@@ -4,13 +4,84 @@ LLM utilities for Blogregator.
 This module contains shared functionality for interacting with LLMs.
 """
 
+import hashlib
 import json
+import logging
 import os
 import time
 from typing import Any, Literal
 
 from litellm import completion
 
+from blogregator.database import get_connection
+
+logger = logging.getLogger(__name__)
+
+# Cached responses older than this are ignored (and overwritten by the next call)
+DEFAULT_CACHE_MAX_AGE_HOURS = 24 * 7
+
+
+def _cache_key(
+    model: str,
+    prompt: str,
+    response_schema: dict[str, Any] | None,
+    reasoning_effort: str | None,
+) -> str:
+    """Return a deterministic SHA-256 key for an LLM request."""
+    payload = json.dumps(
+        {
+            "model": model,
+            "prompt": prompt,
+            "response_schema": response_schema,
+            "reasoning_effort": reasoning_effort,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _read_cached_response(key: str) -> dict | None:
+    """
+    Look up a cached LLM response, returning None on a miss or any database error.
+
+    Entries older than LLM_CACHE_MAX_AGE_HOURS count as misses.
+    """
+    max_age_hours = float(os.environ.get("LLM_CACHE_MAX_AGE_HOURS", DEFAULT_CACHE_MAX_AGE_HOURS))
+    try:
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT response FROM llm_cache "
+                "WHERE key = %s AND created_at > NOW() - %s * INTERVAL '1 hour'",
+                (key, max_age_hours),
+            )
+            row = cursor.fetchone()
+        finally:
+            conn.close()
+    except Exception as e:
+        logger.warning("LLM cache lookup failed", extra={"error": str(e)})
+        return None
+    return row["response"] if row else None  # type: ignore
+
+
+def _write_cached_response(key: str, response: dict) -> None:
+    """Store an LLM response in the cache. Failures are logged and otherwise ignored."""
+    try:
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                """INSERT INTO llm_cache (key, response) VALUES (%s, %s::jsonb)
+                ON CONFLICT (key) DO UPDATE SET response = EXCLUDED.response, created_at = NOW()""",
+                (key, json.dumps(response)),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+    except Exception as e:
+        logger.warning("LLM cache write failed", extra={"error": str(e)})
+
 
 def generate_json_from_llm(
     prompt: str,
@@ -19,6 +90,7 @@ def generate_json_from_llm(
     retry_delay: float = 1.0,
     response_schema: dict[str, Any] | None = None,
     reasoning_effort: Literal["low", "medium", "high"] | None = None,
+    use_cache: bool = False,
 ) -> dict:
     """
     Get JSON output from LLM with error handling and retries.
@@ -30,6 +102,10 @@ def generate_json_from_llm(
         retry_delay: Delay between retry attempts in seconds.
         response_schema: Optional format specification for structured outputs.
         reasoning_effort: Optional reasoning effort level for the LLM.
+        use_cache: If True, return a stored response for an identical request
+            (same model, prompt, schema and reasoning effort) no older than
+            LLM_CACHE_MAX_AGE_HOURS instead of calling the LLM, and store fresh
+            responses in the llm_cache table.
 
     Returns:
         dict: The parsed JSON response from the LLM.
@@ -43,6 +119,13 @@ def generate_json_from_llm(
     if not api_key:
         raise ValueError("GEMINI_API_KEY environment variable is not set")
 
+    cache_key = None
+    if use_cache:
+        cache_key = _cache_key(model, prompt, response_schema, reasoning_effort)
+        cached = _read_cached_response(cache_key)
+        if cached is not None:
+            return cached
+
     last_error = None
     for attempt in range(max_retries):
         try:
@@ -69,7 +152,10 @@ def generate_json_from_llm(
                 if "```" in result:
                     result = result.split("```")[0]
 
-            return json.loads(result)
+            parsed = json.loads(result)
+            if cache_key is not None:
+                _write_cached_response(cache_key, parsed)
+            return parsed
 
         except Exception as e:
             last_error = e
@@ -1,7 +1,13 @@
 import datetime
+import functools
+import json
+from collections.abc import Callable
 from typing import Any
 from urllib.parse import urljoin
 
+import lxml.etree
+import lxml.html
+import soupsieve
 from bs4 import BeautifulSoup
 
 from blogregator.utils import fetch_with_retries
@@ -22,7 +28,30 @@ def parse_date(
                 pass
 
 
-def parse_post_list(page_url: str, config: dict[str, Any]) -> list[dict[str, Any]]:
+# Pages reach us as already-decoded text, so any <meta charset> they carry must be ignored
+_UTF8_HTML_PARSER = lxml.html.HTMLParser(encoding="utf-8")
+
+
+def extract_body_html(html: str) -> str:
+    """
+    Return the page's <body> element serialized as HTML.
+
+    Parsing and serialization both happen inside lxml, avoiding a BeautifulSoup
+    tree build and its pure-Python serializer. Falls back to the whole document
+    if the page has no <body>, and returns "" for an empty page.
+    """
+    try:
+        root = lxml.html.document_fromstring(html.encode("utf-8"), parser=_UTF8_HTML_PARSER)
+    except lxml.etree.ParserError:
+        # lxml rejects empty and whitespace-only documents
+        return ""
+    body = root.find("body")
+    return lxml.html.tostring(body if body is not None else root, encoding="unicode")
+
+
+def parse_post_list(
+    page_url: str, config: dict[str, Any], *, html: str | bytes | None = None
+) -> list[dict[str, Any]]:
     """
     Extracts blog post data from a given URL using a JSON configuration object.
 
@@ -37,84 +66,127 @@ def parse_post_list(page_url: str, config: dict[str, Any]) -> list[dict[str, Any
                 "date": {"selector": "CSS_SELECTOR", "attribute": "datetime" or None, "type": "date_string" or "date_iso"}
               }
             }
+        html (str | bytes | None): Already-fetched HTML for page_url. When given,
+            the page is not fetched again.
 
     Returns:
         list[dict[str, Any]]: A list of dictionaries, where each dictionary
         contains 'title', 'post_url', and 'date' for a post.
         Returns an empty list if fetching fails or no posts are found.
     """
-    response = fetch_with_retries(page_url)
+    if html is None:
+        html = fetch_with_retries(page_url).text
+
+    soup = BeautifulSoup(html, "lxml")
+
+    return compile_schema(config)(soup, page_url)
+
+
+def compile_schema(
+    config: dict[str, Any],
+) -> Callable[[BeautifulSoup, str], list[dict[str, Any]]]:
+    """
+    Compile a scraping schema into a reusable extraction function.
+
+    The returned function takes a parsed page and its URL and returns the
+    extracted posts, as described in parse_post_list. CSS selectors are
+    compiled once up front, and compiled schemas are cached by their JSON
+    representation, so repeated checks of the same blog skip both the schema
+    walk and selector compilation.
+    """
+    return _compile_schema(json.dumps(config, sort_keys=True))
+
 
-    soup = BeautifulSoup(response.text, "html.parser")
+@functools.lru_cache(maxsize=256)
+def _compile_schema(config_json: str) -> Callable[[BeautifulSoup, str], list[dict[str, Any]]]:
+    config = json.loads(config_json)
 
     post_item_selector = config.get("post_item_selector")
     if not post_item_selector:
-        print(f"Error: 'post_item_selector' not found in config for {page_url}.")
-        return []
+
+        def missing_item_selector(soup: BeautifulSoup, page_url: str) -> list[dict[str, Any]]:
+            print(f"Error: 'post_item_selector' not found in config for {page_url}.")
+            return []
+
+        return missing_item_selector
 
     fields_config = config.get("fields")
     if not fields_config:
-        print(f"Error: 'fields' not found in config for {page_url}.")
-        return []
-
-    # import pdb; pdb.set_trace()
-    post_elements = soup.select(post_item_selector)
-    if not post_elements:
-        print(f"No post elements found using selector '{post_item_selector}' on {page_url}.")
-        return []
-
-    results: list[dict[str, Any]] = []
-    for post_element in post_elements:
-        post_data: dict[str, str | None] = {"title": None, "post_url": None, "date": None}
-        for field_name, field_spec in fields_config.items():
-            if field_name not in post_data:  # Only process 'title', 'post_url', 'date'
-                continue
-
-            item_selector = field_spec.get("selector")
-            if not item_selector:
+
+        def missing_fields(soup: BeautifulSoup, page_url: str) -> list[dict[str, Any]]:
+            print(f"Error: 'fields' not found in config for {page_url}.")
+            return []
+
+        return missing_fields
+
+    compiled_item_selector = soupsieve.compile(post_item_selector)
+
+    # (field name, compiled selector, attribute to read or None for text, field spec)
+    field_extractors = []
+    fields_missing_selector = []
+    for field_name, field_spec in fields_config.items():
+        if field_name not in ("title", "post_url", "date"):  # Only process these fields
+            continue
+
+        item_selector = field_spec.get("selector")
+        if not item_selector:
+            fields_missing_selector.append(field_name)
+            continue
+
+        attribute_name = field_spec.get("attribute")
+        if field_name == "post_url" and attribute_name is None:
+            attribute_name = "href"
+
+        field_extractors.append(
+            (field_name, soupsieve.compile(item_selector), attribute_name, field_spec)
+        )
+
+    def extract_posts(soup: BeautifulSoup, page_url: str) -> list[dict[str, Any]]:
+        post_elements = compiled_item_selector.select(soup)
+        if not post_elements:
+            print(f"No post elements found using selector '{post_item_selector}' on {page_url}.")
+            return []
+
+        for field_name in fields_missing_selector:
+            print(f"Warning: Missing 'selector' for field '{field_name}' in config for {page_url}.")
+
+        results: list[dict[str, Any]] = []
+        for post_element in post_elements:
+            post_data: dict[str, str | None] = {"title": None, "post_url": None, "date": None}
+            for field_name, selector, attribute_name, field_spec in field_extractors:
+                target_element = selector.select_one(post_element)
+                if not target_element:
+                    # It's common for some fields (e.g. date) to sometimes be missing for a post
+                    continue
+
+                value: str | None = None
+                if attribute_name:
+                    value = target_element.get(attribute_name)
+                else:
+                    value = target_element.get_text(strip=True)
+
+                if value is not None:  # Ensure value was actually extracted
+                    if field_name == "post_url":
+                        if (
+                            field_spec.get("base_url_handling") == "relative_to_page"
+                            and value
+                            and not value.startswith(("http://", "https://", "#"))
+                        ):
+                            value = urljoin(page_url, value)
+                    if field_name == "date":
+                        value = parse_date(
+                            value, field_spec["format"], field_spec.get("alternate_formats", [])
+                        )
+                    post_data[field_name] = value
+
+            # Basic validation: ensure we have at least a title and URL for it to be a useful entry
+            if post_data.get("title") and post_data.get("post_url"):
+                results.append(post_data)  # type: ignore
+            else:
                 print(
-                    f"Warning: Missing 'selector' for field '{field_name}' in config for {page_url}."
+                    f"Skipping a post item from {page_url} due to missing title or URL. Data: {post_data}"
                 )
-                continue
 
-            target_element = post_element.select_one(item_selector)
-            if not target_element:
-                # It's common for some fields (e.g. date) to sometimes be missing for a post
-                # print(f"Warning: Element for field '{field_name}' with selector '{item_selector}' not found in a post item on {page_url}.")
-                continue
+        return results
 
-            value: str | None = None
-            attribute_name = field_spec.get("attribute")
-            if field_name == "post_url" and attribute_name is None:
-                attribute_name = "href"
-
-            if attribute_name:
-                value = target_element.get(attribute_name)
-            else:
-                value = target_element.get_text(strip=True)
-
-            if value is not None:  # Ensure value was actually extracted
-                if field_name == "post_url":
-                    if (
-                        field_spec.get("base_url_handling") == "relative_to_page"
-                        and value
-                        and not value.startswith(("http://", "https://", "#"))
-                    ):
-                        value = urljoin(page_url, value)
-                if field_name == "date":
-                    value = parse_date(
-                        value, field_spec["format"], field_spec.get("alternate_formats", [])
-                    )
-                post_data[field_name] = value
-
-        # Basic validation: ensure we have at least a title and URL for it to be a useful entry
-        if post_data.get("title") and post_data.get("post_url"):
-            results.append(post_data)  # type: ignore
-            # We initialized with None, but now we're appending a dict that might still have Nones
-            # but the important ones (title, post_url) are checked.
-        else:
-            print(
-                f"Skipping a post item from {page_url} due to missing title or URL. Data: {post_data}"
-            )
-
-    return results
+    return extract_posts
@@ -1,13 +1,14 @@
+import re
 from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any
 
-import psycopg2
-import psycopg2.extras
+import soupsieve
 import typer
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
-from blogregator.database import get_connection
+from blogregator.database import get_connection, tuple_cursor
 from blogregator.llm import generate_json_from_llm
 from blogregator.utils import fetch_with_retries, multiline_user_input
 
@@ -33,29 +34,30 @@ post_cli = typer.Typer(name="post", help="Manage and view blog posts.")
 @post_cli.command(name="view")
 def view_post(post_id: int = typer.Argument(..., help="ID of the post to view")):
     """View detailed information for a single post."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        SELECT
-            p.id,
-            p.title,
-            p.url,
-            p.publication_date,
-            p.reading_time,
-            p.summary,
-            STRING_AGG(t.name, ', ' ORDER BY t.name) as topics
-        FROM posts p
-        LEFT JOIN post_topics tp ON p.id = tp.post_id
-        LEFT JOIN topics t ON t.id = tp.topic_id
-        WHERE p.id = %s
-        GROUP BY p.id;
-        """,
-        (post_id,),
-    )
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT
+                p.id,
+                p.title,
+                p.url,
+                p.publication_date,
+                p.reading_time,
+                p.summary,
+                (
+                    SELECT ARRAY_AGG(t.name ORDER BY t.name)
+                    FROM post_topics tp
+                    JOIN topics t ON t.id = tp.topic_id
+                    WHERE tp.post_id = p.id
+                ) AS topics
+            FROM posts p
+            WHERE p.id = %s;
+            """,
+            (post_id,),
+        )
 
-    row: Mapping[str, Any] = cursor.fetchone()  # type: ignore
-    conn.close()
+        row: Mapping[str, Any] = cursor.fetchone()  # type: ignore
 
     if not row:
         typer.echo("Post not found.")
@@ -65,7 +67,7 @@ def view_post(post_id: int = typer.Argument(..., help="ID of the post to view"))
     typer.echo(f"URL: {row['url']}")
     typer.echo(f"Published: {row['publication_date']}")
     if row.get("topics"):
-        typer.echo(f"\nTopics: {row['topics']}")
+        typer.echo(f"\nTopics: {', '.join(row['topics'])}")
     if row.get("reading_time"):
         typer.echo(f"Reading time: {row['reading_time']} min")
     if row.get("summary"):
@@ -78,23 +80,22 @@ def list_posts(
     limit: int = typer.Option(10, "-n", help="Max number of posts to display"),
 ):
     """View recent posts for a specific blog."""
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("SELECT id FROM blogs WHERE name = %s", (blog_name,))
-    result: dict[str, int] | None = cursor.fetchone()  # type: ignore
-    if result is None:
-        typer.echo("Blog not found.")
-        return
+    with get_connection() as conn:
+        cursor = conn.cursor()
 
-    blog_id = result["id"]
-    cursor.execute(
-        "SELECT id, title, publication_date, url FROM posts WHERE blog_id = %s "
-        "ORDER BY publication_date DESC LIMIT %s",
-        (blog_id, limit),
-    )
-    posts: list[Mapping[str, Any]] = cursor.fetchall()  # type: ignore
-    conn.close()
+        cursor.execute("SELECT id FROM blogs WHERE name = %s", (blog_name,))
+        result: dict[str, int] | None = cursor.fetchone()  # type: ignore
+        if result is None:
+            typer.echo("Blog not found.")
+            return
+
+        blog_id = result["id"]
+        cursor.execute(
+            "SELECT id, title, publication_date, url FROM posts WHERE blog_id = %s "
+            "ORDER BY publication_date DESC LIMIT %s",
+            (blog_id, limit),
+        )
+        posts: list[Mapping[str, Any]] = cursor.fetchall()  # type: ignore
 
     if not posts:
         typer.echo("No posts found for this blog.")
@@ -117,15 +118,16 @@ def reparse_post(
     ),
 ):
     """Reparse a specific post."""
-    # get the post ID
-    conn = get_connection()
-    curr = conn.cursor()
-
-    curr.execute(
-        "SELECT blog_id, title, url AS post_url, publication_date AS date FROM posts WHERE url = %s",
-        (url,),
-    )
-    result: dict[str, Any] | None = curr.fetchone()  # type: ignore
+    # Connections are only held around the queries: the content prompt, the
+    # fetch and the LLM calls below can take minutes.
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT blog_id, title, url AS post_url, publication_date AS date "
+            "FROM posts WHERE url = %s",
+            (url,),
+        )
+        result: dict[str, Any] | None = cursor.fetchone()  # type: ignore
 
     if result is None:
         typer.echo("Post not found.")
@@ -136,18 +138,27 @@ def reparse_post(
     else:
         post_content = None
 
-    # Legacy interface - process and save to DB
-    result_obj = process_single_post(result, post_content)
-    if any([result_obj.summary, result_obj.reading_time, result_obj.topics]):
-        conn = get_connection()
-        cursor = conn.cursor()
-        try:
-            # Add new topics to database if any
+    with get_connection() as conn:
+        existing_topics = fetch_topic_names(conn)
+
+    # Legacy interface - process and save to DB. Reparsing exists to get a new
+    # answer, so it leaves the LLM cache off.
+    result_obj = process_single_post(result, post_content, existing_topics=existing_topics)
+    if not any([result_obj.summary, result_obj.reading_time, result_obj.topics]):
+        typer.echo(
+            typer.style("Post processing failed - no content extracted", fg=typer.colors.RED)
+        )
+        return
+
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            # Add new topics to database if any, in sorted order like process_blog
+            # so concurrent inserts of the same topics can't deadlock
             if result_obj.topics:
-                psycopg2.extras.execute_values(
-                    cursor,
-                    "INSERT INTO topics (name) VALUES %s ON CONFLICT DO NOTHING",
-                    [(t,) for t in result_obj.topics],
+                cursor.execute(
+                    "INSERT INTO topics (name) SELECT unnest(%s::text[]) ON CONFLICT DO NOTHING",
+                    (sorted(result_obj.topics),),
                 )
 
             # Add the post
@@ -165,19 +176,17 @@ def reparse_post(
                 upsert=True,
                 full_text=result_obj.extracted_text,
             )
-            conn.commit()
-            typer.echo("Post reprocessed successfully.")
-        except Exception as e:
-            typer.echo(typer.style(f"Error saving post: {e}", fg=typer.colors.RED))
-        finally:
-            conn.close()
-    else:
-        typer.echo(
-            typer.style("Post processing failed - no content extracted", fg=typer.colors.RED)
-        )
+        typer.echo("Post reprocessed successfully.")
+    except Exception as e:
+        typer.echo(typer.style(f"Error saving post: {e}", fg=typer.colors.RED))
 
 
-def process_single_post(post: dict[str, Any], post_text: str | None = None) -> PostProcessingResult:
+def process_single_post(
+    post: dict[str, Any],
+    post_text: str | None = None,
+    existing_topics: list[str] | None = None,
+    use_cache: bool = False,
+) -> PostProcessingResult:
     """
     Extract metadata from a post without writing to database.
 
@@ -187,6 +196,11 @@ def process_single_post(post: dict[str, Any], post_text: str | None = None) -> P
             - post_url: The URL of the post
             - date: The publication date of the post
         post_text: Optional pre-fetched post content
+        existing_topics: Optional list of known topic names, passed to the topic
+            extractor as context. Batch callers should load it once and pass it
+            in; if None, it is queried from the database.
+        use_cache: If True, reuse cached LLM responses for unchanged text instead
+            of asking for a fresh summary and topics
 
     Returns:
         PostProcessingResult: Processing results with extracted metadata and error info
@@ -203,8 +217,9 @@ def process_single_post(post: dict[str, Any], post_text: str | None = None) -> P
         # Try to get post content
         try:
             if post_text is None:
-                content = fetch_with_retries(post["post_url"]).text
-                result.extracted_text = extract_post_text(content)
+                # Don't keep the raw page referenced while the LLM calls run;
+                # only the extracted text is needed from here on.
+                result.extracted_text = extract_post_text(fetch_with_retries(post["post_url"]).text)
             else:
                 result.extracted_text = post_text
         except Exception as e:
@@ -215,37 +230,44 @@ def process_single_post(post: dict[str, Any], post_text: str | None = None) -> P
         # Attempt all three LLM extractions
         llm_errors = []
 
-        # Extract summary
-        try:
-            summary_data = extract_summary(result.extracted_text)
-            result.summary = summary_data.get("summary")
-            technical_density = summary_data.get("technical_density", 2)
-        except Exception as e:
-            llm_errors.append(f"summary: {str(e)}")
-            technical_density = 2
-
-        # Extract reading time
-        try:
-            result.reading_time = estimate_reading_time(result.extracted_text, technical_density)
-        except Exception as e:
-            llm_errors.append(f"reading_time: {str(e)}")
-
-        # Extract topics
-        try:
-            # Get existing topics for context
-            conn = get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT name FROM topics")
-            existing_topics = [row.get("name", "") for row in cursor.fetchall()]
-            cursor.close()
-            conn.close()
-
-            topics_data = extract_topics(result.extracted_text, existing_topics)
-            result.topics = topics_data.get("matched_topics", []) + topics_data.get(
-                "new_topic_suggestions", []
+        # Summary and topics are independent LLM round-trips, so run them
+        # concurrently; reading time only needs the summary's technical density.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            summary_future = executor.submit(
+                extract_summary, result.extracted_text, use_cache=use_cache
+            )
+            topics_future = executor.submit(
+                _extract_topics_with_context,
+                result.extracted_text,
+                existing_topics=existing_topics,
+                use_cache=use_cache,
             )
-        except Exception as e:
-            llm_errors.append(f"topics: {str(e)}")
+
+            # Extract summary
+            try:
+                summary_data = summary_future.result()
+                result.summary = summary_data.get("summary")
+                technical_density = summary_data.get("technical_density", 2)
+            except Exception as e:
+                llm_errors.append(f"summary: {str(e)}")
+                technical_density = 2
+
+            # Extract reading time
+            try:
+                result.reading_time = estimate_reading_time(
+                    result.extracted_text, technical_density
+                )
+            except Exception as e:
+                llm_errors.append(f"reading_time: {str(e)}")
+
+            # Extract topics
+            try:
+                topics_data = topics_future.result()
+                result.topics = topics_data.get("matched_topics", []) + topics_data.get(
+                    "new_topic_suggestions", []
+                )
+            except Exception as e:
+                llm_errors.append(f"topics: {str(e)}")
 
         # Set success and error info
         if llm_errors:
@@ -263,6 +285,55 @@ def process_single_post(post: dict[str, Any], post_text: str | None = None) -> P
     return result
 
 
+def fetch_topic_names(conn) -> list[str]:
+    """
+    Return the names of all known topics, sorted.
+
+    The list is embedded in the topic prompt, so a stable order keeps the prompt
+    (and its llm_cache key) identical while the set of topics is unchanged.
+    """
+    cursor = tuple_cursor(conn)
+    cursor.execute("SELECT name FROM topics ORDER BY name")
+    return [name for (name,) in cursor]
+
+
+def _extract_topics_with_context(
+    content: str,
+    model: str = "gemini/gemini-3-flash-preview",
+    existing_topics: list[str] | None = None,
+    use_cache: bool = False,
+) -> dict:
+    """Extract topics, using the known topics as context (queried if not given)."""
+    if existing_topics is None:
+        with get_connection() as conn:
+            existing_topics = fetch_topic_names(conn)
+
+    return extract_topics(content, existing_topics, model, use_cache=use_cache)
+
+
+_INSERT_POST_SQL = """
+    INSERT INTO posts (blog_id, title, url, publication_date, reading_time, summary, full_text)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+    RETURNING id
+"""
+
+_UPSERT_POST_SQL = """
+    INSERT INTO posts (blog_id, title, url, publication_date, reading_time, summary, full_text)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+    ON CONFLICT (url) DO UPDATE SET
+    summary = EXCLUDED.summary,
+    reading_time = EXCLUDED.reading_time,
+    full_text = EXCLUDED.full_text
+    RETURNING id
+"""
+
+_LINK_POST_TOPICS_SQL = """
+    INSERT INTO post_topics (post_id, topic_id)
+    SELECT %s, id FROM topics WHERE name = ANY(%s)
+    ON CONFLICT DO NOTHING
+"""
+
+
 def add_post_to_db(
     cursor,
     blog_id: int,
@@ -272,17 +343,8 @@ def add_post_to_db(
     full_text: str | None = None,
 ):
     """Add a post to the database if it isn't already registered."""
-    upsert_clause = """
-        ON CONFLICT (url) DO UPDATE SET
-        summary = EXCLUDED.summary,
-        reading_time = EXCLUDED.reading_time,
-        full_text = EXCLUDED.full_text
-    """
-
     cursor.execute(
-        f"""INSERT INTO posts (blog_id, title, url, publication_date, reading_time, summary, full_text)
-        VALUES (%s, %s, %s, %s, %s, %s, %s) {upsert_clause if upsert else ""}
-        """,
+        _UPSERT_POST_SQL if upsert else _INSERT_POST_SQL,
         (
             blog_id,
             post_info["title"],
@@ -293,18 +355,56 @@ def add_post_to_db(
             full_text,
         ),
     )
-    cursor.execute("SELECT id FROM posts WHERE url = %s", (post_info["post_url"],))
     post_id = cursor.fetchone()["id"]
     topics = metadata.get("matched_topics", []) + metadata.get("new_topic_suggestions", [])
 
-    # get the IDs of each topic
-    cursor.execute("SELECT id FROM topics WHERE name = ANY(%s)", (topics,))
-    topic_ids = [row["id"] for row in cursor.fetchall()]
+    # Resolve topic names to IDs and link them in a single statement
+    cursor.execute(_LINK_POST_TOPICS_SQL, (post_id, topics))
+
+
+def add_posts_to_db(cursor, blog_id: int, results: list[PostProcessingResult]):
+    """
+    Insert a batch of processed posts and link their topics in one statement.
+
+    The topics themselves must already exist. Equivalent to calling
+    add_post_to_db for each result, but costs a single round-trip for the whole
+    batch instead of two per post.
+    """
+    if not results:
+        return
 
-    psycopg2.extras.execute_values(
-        cursor,
-        """INSERT INTO post_topics (post_id, topic_id) VALUES %s ON CONFLICT DO NOTHING""",
-        [(post_id, topic_id) for topic_id in topic_ids],
+    posts = [r.original_post for r in results]
+    topic_links = [
+        (r.original_post["post_url"], topic) for r in results for topic in r.topics or []
+    ]
+    cursor.execute(
+        """
+        WITH inserted AS (
+            INSERT INTO posts
+                (blog_id, title, url, publication_date, reading_time, summary, full_text)
+            SELECT %s, * FROM unnest(
+                %s::text[], %s::text[], %s::timestamptz[], %s::int[], %s::text[], %s::text[]
+            )
+            RETURNING id, url
+        )
+        INSERT INTO post_topics (post_id, topic_id)
+        SELECT inserted.id, topics.id
+        FROM unnest(%s::text[], %s::text[]) AS link(url, topic)
+        JOIN inserted ON inserted.url = link.url
+        JOIN topics ON topics.name = link.topic
+        ON CONFLICT DO NOTHING
+        """,
+        (
+            blog_id,
+            [p["title"] for p in posts],
+            [p["post_url"] for p in posts],
+            [p["date"] for p in posts],
+            [r.reading_time for r in results],
+            [r.summary for r in results],
+            [r.extracted_text for r in results],
+            [url for url, _ in topic_links],
+            [topic for _, topic in topic_links],
+        ),
     )
 
 
@@ -318,28 +418,32 @@ def extract_post_metadata(
 
     text_content = post_text
     if text_content is None:
-        content = fetch_with_retries(post_url).text
-        text_content = extract_post_text(content)
+        text_content = extract_post_text(fetch_with_retries(post_url).text)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        summary_future = executor.submit(extract_summary, text_content, model)
+        topics_future = executor.submit(_extract_topics_with_context, text_content, model)
+        summary = summary_future.result()
+        topics = topics_future.result()
 
-    summary = extract_summary(text_content, model)
     metadata.update(summary)
 
     reading_time = estimate_reading_time(text_content, summary.get("technical_density", 2))
     metadata["reading_time"] = reading_time
 
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT name FROM topics")
-    existing_topics: list[str] = [row.get("name", "") for row in cursor.fetchall()]  # type: ignore
-    cursor.close()
-    conn.close()
-
-    topics = extract_topics(text_content, existing_topics, model)
     metadata.update(topics)
 
     return metadata
 
 
+# Common non-content elements stripped from a post before extracting its text
+_NON_CONTENT_SELECTOR = soupsieve.compile("nav, aside, header, footer, script, style")
+
+# Every candidate container lives inside <body>, so nodes under <head> (inline
+# scripts, styles, JSON-LD) are skipped at parse time instead of being built.
+_BODY_ONLY = SoupStrainer("body")
+
+
 def extract_post_text(html_content: str) -> str:
     """
     Extracts the main article text from HTML content.
@@ -354,7 +458,7 @@ def extract_post_text(html_content: str) -> str:
     Returns:
         A string containing the cleaned text content of the post.
     """
-    soup = BeautifulSoup(html_content, "html.parser")
+    soup = BeautifulSoup(html_content, "lxml", parse_only=_BODY_ONLY)
 
     # Find the main article content. The <article> tag is a strong semantic indicator.
     # If it doesn't exist (or if there are multiple), fall back to the main role, and finally the whole body.
@@ -370,7 +474,7 @@ def extract_post_text(html_content: str) -> str:
             return "Unable to parse post content."
 
     # Remove common non-content elements to clean up the text
-    for tag_to_remove in article_body(["nav", "aside", "header", "footer", "script", "style"]):
+    for tag_to_remove in _NON_CONTENT_SELECTOR.select(article_body):
         tag_to_remove.decompose()
 
     # Get the text, with separators to preserve paragraph breaks.
@@ -380,38 +484,67 @@ def extract_post_text(html_content: str) -> str:
     return text_content
 
 
+_WORD_RE = re.compile(r"\S+")
+
+# Reading speed (words per minute) by technical density
+_WPM_BY_DENSITY = {
+    1: 220,  # Reflective/anecdotal - flows quickly
+    2: 180,  # Practitioner content - need to think through examples
+    3: 100,  # Deep technical - lots of pausing to understand
+}
+
+
 def estimate_reading_time(content: str, technical_density: int) -> int:
     """Estimate reading time in minutes based on word count and technical complexity."""
-    word_count = len(content.split())
+    # subn() counts every match inside the regex engine's C loop, without a
+    # Python-level iteration per word or a list of all the words
+    word_count = _WORD_RE.subn("", content)[1]
 
     # Adjust WPM based on technical density
-    wpm_map = {
-        1: 220,  # Reflective/anecdotal - flows quickly
-        2: 180,  # Practitioner content - need to think through examples
-        3: 100,  # Deep technical - lots of pausing to understand
-    }
-
-    wpm = wpm_map.get(technical_density, 180)  # Default to level 2
+    wpm = _WPM_BY_DENSITY.get(technical_density, 180)  # Default to level 2
     return max(1, round(word_count / wpm))
 
 
-def extract_summary(content: str, model: str = "gemini/gemini-3-flash-preview") -> dict:
-    """Extract summary and technical density."""
-    prompt = SUMMARY_PROMPT.format(content=content)
+def extract_summary(
+    content: str, model: str = "gemini/gemini-3-flash-preview", use_cache: bool = False
+) -> dict:
+    """Extract summary and technical density.
+
+    With use_cache, responses are cached by prompt, so re-processing unchanged
+    text skips the LLM call. Editing SUMMARY_PROMPT invalidates the cache.
+    """
+    prompt = "".join((_SUMMARY_PROMPT_HEAD, content, _SUMMARY_PROMPT_TAIL))
 
     return generate_json_from_llm(
-        prompt=prompt, model=model, response_schema=SUMMARY_SCHEMA, reasoning_effort="low"
+        prompt=prompt,
+        model=model,
+        response_schema=SUMMARY_SCHEMA,
+        reasoning_effort="low",
+        use_cache=use_cache,
     )
 
 
 def extract_topics(
-    content: str, existing_topics: list[str], model: str = "gemini/gemini-3-flash-preview"
+    content: str,
+    existing_topics: list[str],
+    model: str = "gemini/gemini-3-flash-preview",
+    use_cache: bool = False,
 ) -> dict:
-    """Extract topics from the blog post."""
+    """Extract topics from the blog post.
+
+    Cached like extract_summary; the key covers the existing topic list, so
+    adding topics naturally yields fresh suggestions.
+    """
     topic_string = ", ".join(existing_topics)
-    prompt = TOPIC_PROMPT.format(content=content, existing_topics=topic_string)
+    prompt = "".join(
+        (_TOPIC_PROMPT_HEAD, topic_string, _TOPIC_PROMPT_MIDDLE, content, _TOPIC_PROMPT_TAIL)
+    )
     return generate_json_from_llm(
-        prompt=prompt, model=model, response_schema=TOPIC_SCHEMA, reasoning_effort="low"
+        prompt=prompt,
+        model=model,
+        response_schema=TOPIC_SCHEMA,
+        reasoning_effort="low",
+        use_cache=use_cache,
     )
 
 
@@ -508,3 +641,9 @@ Blog Content:
 
 Return ONLY the JSON object, no additional text.
 """
+
+# The prompts are split around their placeholders once at import, so building a
+# prompt is a plain join rather than a str.format() scan of the whole template.
+_SUMMARY_PROMPT_HEAD, _, _SUMMARY_PROMPT_TAIL = SUMMARY_PROMPT.partition("{content}")
+_TOPIC_PROMPT_HEAD, _, _topic_prompt_rest = TOPIC_PROMPT.partition("{existing_topics}")
+_TOPIC_PROMPT_MIDDLE, _, _TOPIC_PROMPT_TAIL = _topic_prompt_rest.partition("{content}")
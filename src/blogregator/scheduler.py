@@ -77,7 +77,10 @@ def scheduled_blog_check_with_retry():
 
     try:
         # Run blog check
-        result = run_blog_check(max_workers=config.max_workers)
+        result = run_blog_check(
+            max_workers=config.max_workers,
+            max_concurrent_blogs=config.max_concurrent_blogs,
+        )
 
         _last_check_time = datetime.utcnow()
         _last_check_result = {
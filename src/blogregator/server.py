@@ -6,13 +6,14 @@ import logging.handlers
 import os
 import signal
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
 
+import psycopg2.extras
 import pythonjsonlogger.json
 import uvicorn
-from bs4 import BeautifulSoup
 from fastapi import BackgroundTasks, FastAPI, HTTPException, Query
 from fastapi.responses import HTMLResponse, JSONResponse
 from pydantic import BaseModel, Field
@@ -20,9 +21,9 @@ from pydantic import BaseModel, Field
 from blogregator.blog import generate_schema, get_domain_name
 from blogregator.config import get_config
 from blogregator.core import run_blog_check, send_newsletter_if_needed
-from blogregator.database import get_connection
+from blogregator.database import close_pool, get_connection
 from blogregator.llm import generate_json_from_llm
-from blogregator.parser import parse_post_list
+from blogregator.parser import extract_body_html, parse_post_list
 from blogregator.prompts import CORRECT_SCHEMA
 from blogregator.scheduler import (
     get_scheduler_status,
@@ -132,10 +133,16 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down Blogregator server...")
     stop_scheduler()
+    close_pool()
     logger.info("Server shut down successfully")
 
 
 # Create FastAPI app
+#
+# Handlers that touch the database, SMTP, the LLM or Playwright are all
+# blocking, so they are declared with plain `def`: FastAPI runs those in its
+# threadpool instead of stalling the event loop (which the scheduler shares).
+# Only handlers that never block are `async def`.
 app = FastAPI(
     title="Blogregator Server",
     description="Automated blog monitoring and newsletter system",
@@ -145,30 +152,33 @@ app = FastAPI(
 
 
 @app.get("/", response_class=HTMLResponse)
-async def dashboard():
+def dashboard():
     """Display a simple status dashboard."""
     config = get_config()
     status = get_scheduler_status()
 
     # Get recent stats from database
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
+        with get_connection() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute("SELECT COUNT(*) as count FROM blogs WHERE scraping_successful = true")
-        active_blogs = cursor.fetchone()["count"]  # type: ignore
-
-        cursor.execute(
-            "SELECT COUNT(*) as count FROM posts WHERE discovered_date > NOW() - INTERVAL '24 hours'"
-        )
-        posts_24h = cursor.fetchone()["count"]  # type: ignore
-
-        cursor.execute(
-            "SELECT COUNT(*) as count FROM posts WHERE discovered_date > NOW() - INTERVAL '7 days'"
-        )
-        posts_7d = cursor.fetchone()["count"]  # type: ignore
-
-        conn.close()
+            # Fetch all stats in a single round-trip
+            cursor.execute(
+                """
+                SELECT
+                    (SELECT COUNT(*) FROM blogs WHERE scraping_successful = true) as active_blogs,
+                    COUNT(*) FILTER (
+                        WHERE discovered_date > NOW() - INTERVAL '24 hours'
+                    ) as posts_24h,
+                    COUNT(*) as posts_7d
+                FROM posts
+                WHERE discovered_date > NOW() - INTERVAL '7 days'
+                """
+            )
+            stats = cursor.fetchone()
+            active_blogs = stats["active_blogs"]  # type: ignore
+            posts_24h = stats["posts_24h"]  # type: ignore
+            posts_7d = stats["posts_7d"]  # type: ignore
     except Exception as e:
         logger.error("Failed to fetch dashboard stats", extra={"error": str(e)})
         active_blogs = posts_24h = posts_7d = "Error"
@@ -798,13 +808,15 @@ async def add_blog_page():
                     return;
                 }
 
+                // Generating again for the same page wants a new answer, not the cached one
+                const noCache = url === currentUrl;
                 currentUrl = url;
                 const btn = document.getElementById('generateBtn');
                 btn.disabled = true;
                 btn.innerHTML = 'Generating<span class="loading"></span>';
 
                 try {
-                    const response = await fetch('/schema?sample=true', {
+                    const response = await fetch('/schema?sample=true' + (noCache ? '&no_cache=true' : ''), {
                         method: 'POST',
                         headers: { 'Content-Type': 'application/json' },
                         body: JSON.stringify({ url })
@@ -1040,12 +1052,14 @@ async def add_blog_page():
 
 
 @app.get("/health")
-async def health_check():
+def health_check():
     """Health check endpoint for Docker and monitoring."""
     try:
-        # Test database connection
-        conn = get_connection()
-        conn.close()
+        # Test database connection with a real round-trip; handing out a pooled
+        # connection alone sends nothing to the server.
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
 
         status = get_scheduler_status()
 
@@ -1070,25 +1084,29 @@ async def health_check():
 
 
 @app.get("/status")
-async def get_status():
+def get_status():
     """Get current server status and scheduler information."""
     config = get_config()
     status = get_scheduler_status()
 
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
+        with get_connection() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute("SELECT COUNT(*) as count FROM blogs WHERE scraping_successful = true")
-        active_blogs = cursor.fetchone()["count"]  # type: ignore
-
-        cursor.execute("SELECT COUNT(*) as count FROM blogs WHERE scraping_successful = false")
-        error_blogs = cursor.fetchone()["count"]  # type: ignore
-
-        cursor.execute("SELECT COUNT(*) as count FROM posts")
-        total_posts = cursor.fetchone()["count"]  # type: ignore
-
-        conn.close()
+            # Fetch all stats in a single round-trip
+            cursor.execute(
+                """
+                SELECT
+                    COUNT(*) FILTER (WHERE scraping_successful) as active_blogs,
+                    COUNT(*) FILTER (WHERE NOT scraping_successful) as error_blogs,
+                    (SELECT COUNT(*) FROM posts) as total_posts
+                FROM blogs
+                """
+            )
+            stats = cursor.fetchone()
+            active_blogs = stats["active_blogs"]  # type: ignore
+            error_blogs = stats["error_blogs"]  # type: ignore
+            total_posts = stats["total_posts"]  # type: ignore
 
         return {
             "status": "running",
@@ -1117,7 +1135,12 @@ async def trigger_check(background_tasks: BackgroundTasks, blog_id: int | None =
 
     def run_check():
         try:
-            result = run_blog_check(blog_id=blog_id, max_workers=get_config().max_workers)
+            config = get_config()
+            result = run_blog_check(
+                blog_id=blog_id,
+                max_workers=config.max_workers,
+                max_concurrent_blogs=config.max_concurrent_blogs,
+            )
             logger.info("Manual blog check completed", extra={"success": result.success})
         except Exception as e:
             logger.error("Manual blog check failed", extra={"error": str(e)}, exc_info=True)
@@ -1132,7 +1155,7 @@ async def trigger_check(background_tasks: BackgroundTasks, blog_id: int | None =
 
 
 @app.post("/newsletter")
-async def trigger_newsletter(hour_window: int = 24):
+def trigger_newsletter(hour_window: int = 24):
     """Manually trigger newsletter send."""
     logger.info("Manual newsletter send triggered", extra={"hour_window": hour_window})
 
@@ -1151,77 +1174,110 @@ async def trigger_newsletter(hour_window: int = 24):
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+# Largest page GET /blogs serves when a limit is given
+MAX_BLOGS_PAGE_SIZE = 1000
+
+
 @app.get("/blogs")
-async def list_blogs():
-    """List all blogs with their status."""
+def list_blogs(
+    limit: int | None = Query(None, ge=1, le=MAX_BLOGS_PAGE_SIZE),
+    after: str | None = None,
+):
+    """List blogs with their status, ordered by URL.
+
+    Args:
+        limit: Maximum number of blogs to return, 1 to MAX_BLOGS_PAGE_SIZE
+            (all if omitted)
+        after: Only return blogs whose URL sorts after this one; pass the last
+            URL of the previous page to fetch the next
+
+    Returns:
+        Blogs in URL order
+    """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
+        with get_connection() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute(
-            """
-            SELECT
-                id,
-                url,
-                CASE
-                    WHEN scraping_successful THEN 'Active'
-                    ELSE 'Error'
-                END as status,
-                last_checked,
-                created_at
-            FROM blogs
-            ORDER BY url
-            """
-        )
-        blogs = cursor.fetchall()
-        conn.close()
+            # Keyset pagination on the unique url index: each page is an index
+            # range scan rather than an OFFSET that re-reads every earlier row.
+            # LIMIT NULL means no limit.
+            cursor.execute(
+                """
+                SELECT
+                    id,
+                    url,
+                    CASE
+                        WHEN scraping_successful THEN 'Active'
+                        ELSE 'Error'
+                    END as status,
+                    last_checked,
+                    created_at
+                FROM blogs
+                WHERE %s IS NULL OR url > %s
+                ORDER BY url
+                LIMIT %s
+                """,
+                (after, after, limit),
+            )
+            blogs = cursor.fetchall()
 
-        return {"blogs": [dict(blog) for blog in blogs]}  # type: ignore
+        # RealDictRow is already a dict; return the trusted rows without copying them
+        return {"blogs": blogs}
     except Exception as e:
         logger.error("Failed to list blogs", extra={"error": str(e)})
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
 @app.get("/posts/recent")
-async def get_recent_posts(limit: int = 20):
+def get_recent_posts(limit: int = 20):
     """Get recently discovered posts."""
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
+        with get_connection() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute(
-            """
-            SELECT
-                p.id,
-                p.title,
-                p.url,
-                p.publication_date,
-                p.discovered_date,
-                p.reading_time,
-                p.summary,
-                b.url as blog_name,
-                STRING_AGG(t.name, ', ' ORDER BY t.name) as topics
-            FROM posts p
-            LEFT JOIN blogs b ON b.id = p.blog_id
-            LEFT JOIN post_topics pt ON p.id = pt.post_id
-            LEFT JOIN topics t ON t.id = pt.topic_id
-            GROUP BY p.id, b.url
-            ORDER BY p.discovered_date DESC
-            LIMIT %s
-            """,
-            (limit,),
-        )
-        posts = cursor.fetchall()
-        conn.close()
+            # Take the newest posts first so the LIMIT is answered by walking
+            # idx_posts_discovered_date, then aggregate each post's topics in a
+            # lateral subquery: no (post, topic) row fan-out and no GROUP BY.
+            cursor.execute(
+                """
+                SELECT
+                    p.id,
+                    p.title,
+                    p.url,
+                    p.publication_date,
+                    p.discovered_date,
+                    p.reading_time,
+                    p.summary,
+                    b.url as blog_name,
+                    pt.topics
+                FROM (
+                    SELECT id, blog_id, title, url, publication_date, discovered_date,
+                           reading_time, summary
+                    FROM posts
+                    ORDER BY discovered_date DESC
+                    LIMIT %s
+                ) p
+                LEFT JOIN blogs b ON b.id = p.blog_id
+                LEFT JOIN LATERAL (
+                    SELECT STRING_AGG(t.name, ', ' ORDER BY t.name) as topics
+                    FROM post_topics tp
+                    JOIN topics t ON t.id = tp.topic_id
+                    WHERE tp.post_id = p.id
+                ) pt ON true
+                ORDER BY p.discovered_date DESC
+                """,
+                (limit,),
+            )
+            posts = cursor.fetchall()
 
-        return {"posts": [dict(post) for post in posts], "count": len(posts)}  # type: ignore
+        return {"posts": posts, "count": len(posts)}
     except Exception as e:
         logger.error("Failed to get recent posts", extra={"error": str(e)})
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
 @app.get("/logs")
-async def get_logs(lines: int = 100):
+def get_logs(lines: int = 100):
     """Get recent log entries."""
     import json
 
@@ -1254,12 +1310,16 @@ async def get_logs(lines: int = 100):
 
 
 @app.post("/schema")
-async def generate_blog_schema(request: SchemaGenerationRequest, sample: bool = Query(False)):
+def generate_blog_schema(
+    request: SchemaGenerationRequest, sample: bool = Query(False), no_cache: bool = Query(False)
+):
     """Generate a scraping schema for a blog URL using LLM.
 
     Args:
         request: Request containing blog URL
         sample: If True, validate schema and return sample parsed posts
+        no_cache: If True, generate a fresh schema instead of reusing a cached one
+            for an unchanged page
 
     Returns:
         Generated schema with optional validation results
@@ -1271,7 +1331,7 @@ async def generate_blog_schema(request: SchemaGenerationRequest, sample: bool =
         logger.debug("Fetching blog HTML", extra={"url": request.url})
         try:
             response = fetch_with_retries(request.url)
-            html_content = response.content
+            html_content = response.text
         except Exception as e:
             logger.error("Failed to fetch blog URL", extra={"url": request.url, "error": str(e)})
             raise HTTPException(
@@ -1279,13 +1339,12 @@ async def generate_blog_schema(request: SchemaGenerationRequest, sample: bool =
             ) from e
 
         # Extract body content
-        soup = BeautifulSoup(html_content, "html.parser")
-        body_content = str(soup.body) if soup.body else str(soup)
+        body_content = extract_body_html(html_content)
 
         # Generate schema using LLM
         logger.debug("Generating schema with LLM", extra={"url": request.url})
         try:
-            schema = generate_schema(body_content, request.url)
+            schema = generate_schema(body_content, request.url, use_cache=not no_cache)
         except Exception as e:
             logger.error("Failed to generate schema", extra={"url": request.url, "error": str(e)})
             raise HTTPException(
@@ -1304,7 +1363,7 @@ async def generate_blog_schema(request: SchemaGenerationRequest, sample: bool =
         if sample:
             logger.debug("Validating schema with sample parse", extra={"url": request.url})
             try:
-                sample_posts = parse_post_list(request.url, schema)
+                sample_posts = parse_post_list(request.url, schema, html=html_content)
                 response_data["sample_posts"] = sample_posts[:5]  # Return max 5 samples
                 logger.info(
                     "Schema validated successfully",
@@ -1327,8 +1386,32 @@ async def generate_blog_schema(request: SchemaGenerationRequest, sample: bool =
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}") from e
 
 
+def _describe_previous_parse(url: str, schema: dict, html: str) -> tuple[str, str]:
+    """Parse html with a previous schema and describe the outcome for the refine prompt.
+
+    Returns:
+        Tuple of (previous_results, parse_error) for CORRECT_SCHEMA.
+    """
+    try:
+        posts = parse_post_list(url, schema, html=html)
+    except Exception as e:
+        return "Failed to parse posts with previous schema.", str(e)
+
+    if not posts:
+        return "No posts were found using the previous schema.", ""
+
+    # Format first 3 posts for display
+    previous_results = "\n\n".join(
+        [
+            f"Post {i}:\nTitle: {p.get('title', 'No title')}\nURL: {p.get('post_url', 'No URL')}\nDate: {p.get('date', 'No date')}"
+            for i, p in enumerate(posts[:3], 1)
+        ]
+    )
+    return previous_results, ""
+
+
 @app.post("/schema/refine")
-async def refine_blog_schema(request: RefineSchemaRequest, sample: bool = Query(False)):
+def refine_blog_schema(request: RefineSchemaRequest, sample: bool = Query(False)):
     """Refine an existing scraping schema based on user feedback using LLM.
 
     Args:
@@ -1348,7 +1431,7 @@ async def refine_blog_schema(request: RefineSchemaRequest, sample: bool = Query(
         logger.debug("Fetching blog HTML for refinement", extra={"url": request.url})
         try:
             response = fetch_with_retries(request.url)
-            html_content = response.content
+            html_content = response.text
         except Exception as e:
             logger.error(
                 "Failed to fetch blog URL for refinement",
@@ -1358,28 +1441,14 @@ async def refine_blog_schema(request: RefineSchemaRequest, sample: bool = Query(
                 status_code=400, detail=f"Failed to fetch blog URL: {str(e)}"
             ) from e
 
-        # Extract body content
-        soup = BeautifulSoup(html_content, "html.parser")
-        body_content = str(soup.body) if soup.body else str(soup)
-
-        # Try to parse with previous schema to get results
-        previous_results = ""
-        parse_error = ""
-        try:
-            posts = parse_post_list(request.url, request.previous_schema)
-            if posts:
-                # Format first 3 posts for display
-                previous_results = "\n\n".join(
-                    [
-                        f"Post {i}:\nTitle: {p.get('title', 'No title')}\nURL: {p.get('post_url', 'No URL')}\nDate: {p.get('date', 'No date')}"
-                        for i, p in enumerate(posts[:3], 1)
-                    ]
-                )
-            else:
-                previous_results = "No posts were found using the previous schema."
-        except Exception as e:
-            parse_error = str(e)
-            previous_results = "Failed to parse posts with previous schema."
+        # Parsing with the previous schema builds a BeautifulSoup tree while body
+        # extraction runs in lxml (which releases the GIL), so overlap the two.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            previous_parse = executor.submit(
+                _describe_previous_parse, request.url, request.previous_schema, html_content
+            )
+            body_content = extract_body_html(html_content)
+            previous_results, parse_error = previous_parse.result()
 
         # Format the CORRECT_SCHEMA prompt
         formatted_prompt = CORRECT_SCHEMA.format(
@@ -1412,7 +1481,7 @@ async def refine_blog_schema(request: RefineSchemaRequest, sample: bool = Query(
         if sample:
             logger.debug("Validating refined schema with sample parse", extra={"url": request.url})
             try:
-                sample_posts = parse_post_list(request.url, refined_schema)
+                sample_posts = parse_post_list(request.url, refined_schema, html=html_content)
                 response_data["sample_posts"] = sample_posts[:5]  # Return max 5 samples
                 logger.info(
                     "Refined schema validated successfully",
@@ -1437,7 +1506,7 @@ async def refine_blog_schema(request: RefineSchemaRequest, sample: bool = Query(
 
 
 @app.post("/blogs")
-async def add_blog(request: AddBlogRequest, overwrite: bool = Query(False)):
+def add_blog(request: AddBlogRequest, overwrite: bool = Query(False)):
     """Add a new blog to the database with a provided schema.
 
     Args:
@@ -1457,17 +1526,14 @@ async def add_blog(request: AddBlogRequest, overwrite: bool = Query(False)):
         },
     )
 
-    conn = None
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
         # Check if blog already exists
-        cursor.execute("SELECT id FROM blogs WHERE url = %s", (request.url,))
-        existing_blog = cursor.fetchone()
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id FROM blogs WHERE url = %s", (request.url,))
+            existing_blog = cursor.fetchone()
 
         if existing_blog and not overwrite:
-            conn.close()
             logger.warning(
                 "Blog already exists", extra={"url": request.url, "blog_id": existing_blog["id"]}
             )  # type: ignore
@@ -1483,7 +1549,8 @@ async def add_blog(request: AddBlogRequest, overwrite: bool = Query(False)):
         validation_results = None
         scraping_successful = True
 
-        # Validate schema if requested
+        # Validate schema if requested. This fetches the page, so no database
+        # connection is held while it runs.
         if request.validate_schema:
             logger.debug("Validating schema", extra={"url": request.url})
             try:
@@ -1511,41 +1578,41 @@ async def add_blog(request: AddBlogRequest, overwrite: bool = Query(False)):
                     "Schema validation failed", extra={"url": request.url, "error": str(e)}
                 )
 
-        # Save to database
-        schema_json = json.dumps(request.scraping_schema)
-
-        if existing_blog:
-            # Update existing blog
-            cursor.execute(
-                """
-                UPDATE blogs
-                SET scraping_schema = %s, scraping_successful = %s, last_modified_at = NOW()
-                WHERE url = %s
-                RETURNING id
-                """,
-                (schema_json, scraping_successful, request.url),
-            )
-            result = cursor.fetchone()
-            blog_id = result["id"]  # type: ignore
-            message = f"Blog '{display_name}' updated successfully"
-            logger.info("Blog updated", extra={"blog_id": blog_id, "url": request.url})
-        else:
-            # Insert new blog
+        # Save to database; the Json adapter serializes the schema at bind time.
+        # Single upsert: the conflict branch only updates when overwriting is
+        # allowed, and xmax = 0 only for freshly inserted rows.
+        schema_param = psycopg2.extras.Json(request.scraping_schema)
+        with get_connection() as conn:
+            cursor = conn.cursor()
             cursor.execute(
                 """
                 INSERT INTO blogs (url, scraping_schema, scraping_successful)
                 VALUES (%s, %s, %s)
-                RETURNING id
+                ON CONFLICT (url) DO UPDATE
+                SET scraping_schema = EXCLUDED.scraping_schema,
+                    scraping_successful = EXCLUDED.scraping_successful,
+                    last_modified_at = NOW()
+                WHERE %s
+                RETURNING id, (xmax = 0) AS inserted
                 """,
-                (request.url, schema_json, scraping_successful),
+                (request.url, schema_param, scraping_successful, overwrite),
             )
             result = cursor.fetchone()
-            blog_id = result["id"]  # type: ignore
+
+        if result is None:
+            # Another request added the blog while this one was validating
+            raise HTTPException(
+                status_code=409,
+                detail=f"Blog with URL {request.url} already exists. Use ?overwrite=true to update.",
+            )
+
+        blog_id = result["id"]  # type: ignore
+        if result["inserted"]:  # type: ignore
             message = f"Blog '{display_name}' added successfully"
             logger.info("Blog added", extra={"blog_id": blog_id, "url": request.url})
-
-        conn.commit()
-        conn.close()
+        else:
+            message = f"Blog '{display_name}' updated successfully"
+            logger.info("Blog updated", extra={"blog_id": blog_id, "url": request.url})
 
         return {
             "success": True,
@@ -1559,16 +1626,11 @@ async def add_blog(request: AddBlogRequest, overwrite: bool = Query(False)):
         }
 
     except HTTPException:
-        if conn:
-            conn.close()
         raise
     except Exception as e:
         logger.error(
             "Failed to add blog", extra={"url": request.url, "error": str(e)}, exc_info=True
         )
-        if conn:
-            conn.rollback()
-            conn.close()
         raise HTTPException(status_code=500, detail=f"Failed to add blog: {str(e)}") from e
 
 
@@ -3,6 +3,7 @@ import datetime
 import os
 import subprocess
 import tempfile
+import threading
 import time
 from dataclasses import dataclass
 
@@ -17,11 +18,15 @@ def utcnow():
 class FetchResponse:
     """Response object mimicking requests.Response for compatibility."""
 
-    content: bytes
     text: str
     status_code: int
     url: str
 
+    @property
+    def content(self) -> bytes:
+        """The body encoded as UTF-8, built on demand so the page isn't held twice."""
+        return self.text.encode("utf-8")
+
     def raise_for_status(self):
         """Raise an exception if status code indicates an error."""
         if self.status_code >= 400:
@@ -34,6 +39,57 @@ class FetchError(Exception):
     pass
 
 
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# Playwright's sync API is bound to the thread that started it, so each fetch
+# thread keeps its own long-lived Chromium instance. Fetches only open a fresh
+# (cheap) browser context instead of paying the browser launch cost every time.
+_browser_state = threading.local()
+
+
+def _get_browser():
+    """Return this thread's Chromium browser, launching it on first use."""
+    browser = getattr(_browser_state, "browser", None)
+    if browser is None or not browser.is_connected():
+        playwright = getattr(_browser_state, "playwright", None)
+        if playwright is None:
+            playwright = sync_playwright().start()
+            _browser_state.playwright = playwright
+        browser = playwright.chromium.launch(headless=True)
+        _browser_state.browser = browser
+    return browser
+
+
+def _reset_browser():
+    """Tear down this thread's browser so the next fetch starts from a clean slate."""
+    browser = getattr(_browser_state, "browser", None)
+    playwright = getattr(_browser_state, "playwright", None)
+    _browser_state.browser = None
+    _browser_state.playwright = None
+    try:
+        if browser is not None:
+            browser.close()
+    except Exception:
+        pass
+    try:
+        if playwright is not None:
+            playwright.stop()
+    except Exception:
+        pass
+
+
+# Resource types that never affect the rendered HTML we scrape
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+
+
+def _route_request(route):
+    """Abort requests for assets that don't contribute to the page's HTML."""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
+
 def _fetch_with_playwright(url: str, retries: int = 3, sleep_time: int = 1) -> FetchResponse:
     """
     Internal function that performs the actual Playwright fetch.
@@ -43,11 +99,10 @@ def _fetch_with_playwright(url: str, retries: int = 3, sleep_time: int = 1) -> F
 
     for attempt in range(retries):
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                context = browser.new_context(
-                    user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-                )
+            context = _get_browser().new_context(user_agent=USER_AGENT)
+            try:
+                # Only the rendered DOM is needed, so skip downloading heavy assets
+                context.route("**/*", _route_request)
                 page = context.new_page()
 
                 # Navigate to the URL and wait for network to be idle
@@ -60,24 +115,26 @@ def _fetch_with_playwright(url: str, retries: int = 3, sleep_time: int = 1) -> F
 
                 # Get the fully rendered HTML content
                 html_content = page.content()
+            finally:
+                context.close()
 
-                browser.close()
-
-                result = FetchResponse(
-                    content=html_content.encode("utf-8"),
-                    text=html_content,
-                    status_code=status_code,
-                    url=url,
-                )
+            result = FetchResponse(
+                text=html_content,
+                status_code=status_code,
+                url=url,
+            )
 
-                # Check for HTTP errors
-                result.raise_for_status()
+            # Check for HTTP errors
+            result.raise_for_status()
 
-                return result
+            return result
 
         except Exception as e:
             last_error = e
             print(f"Error fetching the URL (attempt {attempt + 1}/{retries}): {e}")
+            if not isinstance(e, FetchError):
+                # The browser may be wedged; relaunch it on the next attempt
+                _reset_browser()
             if attempt < retries - 1:
                 time.sleep(sleep_time)
 